@@ -15,18 +15,65 @@
 # - https://ffmpeg.org/ffmpeg-utils.html#Expression-Evaluation
 # - http://ffmpeg.org/pipermail/ffmpeg-user/2021-January/051566.html
 
-from os import path
-from ctypes.wintypes import MAX_PATH
-from typing import Dict, List, Tuple
+from os import path, cpu_count, name as os_name, remove, replace, scandir
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Literal, Tuple
 from enum import Enum
-from glob import glob
-import ffmpeg
-from ffmpeg._run import Error
+from dataclasses import dataclass
+import hashlib
+from itertools import islice
+from fractions import Fraction
+import re
+import subprocess
+from functools import cache
+# `ffmpeg` and `concurrent.futures` are imported inside the functions that use them, to keep them off the CLI's startup path
+
+@cache
+def _ffmpeg_has(listing: str, name: str) -> bool:
+    # Check the output of `ffmpeg -encoders`/`ffmpeg -filters` for a component built into the local ffmpeg (probed on first use)
+    try:
+        result = subprocess.run(['ffmpeg', '-hide_banner', f'-{listing}'], capture_output=True, text=True)
+    except OSError:
+        return False
+    return any(line.split()[1:2] == [name] for line in result.stdout.splitlines())
+
+NVENC_MAX_SESSIONS = 5
+
+# Output encoder settings for each `hw_encoder` choice (None = software encoding)
+ENCODERS = {
+    None: {'vcodec': 'libx264', 'crf': 15},
+    'nvenc': {'vcodec': 'h264_nvenc', 'preset': 'p5', 'rc': 'vbr', 'cq': 19},
+    'nvenc_hevc': {'vcodec': 'hevc_nvenc', 'preset': 'p5', 'rc': 'vbr', 'cq': 19},
+}
+
+# Maximum length of an output file path (Windows' MAX_PATH, or the POSIX PATH_MAX)
+if os_name == 'nt':
+    MAX_PATH = 260
+else:
+    from os import pathconf  # POSIX only
+    try:
+        MAX_PATH = pathconf('/', 'PC_PATH_MAX')
+    except OSError:
+        MAX_PATH = -1
+    if MAX_PATH <= 0:  # unsupported or indeterminate limit
+        MAX_PATH = 4096
+
+# Write buffer for concat manifests, large enough to flush most manifests in a single write
+MANIFEST_BUFFER_SIZE = 1 << 20
+
+# Escapes a path for a single-quoted `file '...'` line in a concat manifest. Nothing can be escaped inside ffmpeg's
+#   single quotes, so each quote closes the string, adds an escaped quote, and reopens it.
+_CONCAT_ESCAPE = str.maketrans({"'": "'\\''"})
+
+# Version of the manifest layout, included in manifest hashes (bump when the layout changes, so old manifests aren't reused)
+_MANIFEST_FORMAT = 2
+
+# Number of ffmpeg log lines kept for error reports
+STDERR_TAIL_LINES = 64
+
+# Input file extensions treated as already-encoded videos
+VIDEO_EXTS = ('.mp4', '.mkv', '.mov', '.webm')
 
-# General options
-class GeneralOpt(Enum):
-    input_fps = 'input_fps'
-    
 # Interpolation filter options
 class IntrpOpt(Enum):
     fps = 'fps'
@@ -35,9 +82,21 @@ class IntrpOpt(Enum):
     vsbmc = 'vsbmc'
     me = 'me'
     mb_size = 'mb_size'
-    
-    MODE_OPTS_BLEND = [fps, mi_mode]
-    MODE_OPTS_MCI = [fps, mi_mode, mc_mode, vsbmc, me, mb_size]
+
+# Interpolation filter options used by each `mi_mode`
+_BLEND_KEYS = (IntrpOpt.fps, IntrpOpt.mi_mode)
+_MCI_KEYS = (IntrpOpt.fps, IntrpOpt.mi_mode, IntrpOpt.mc_mode, IntrpOpt.vsbmc, IntrpOpt.me, IntrpOpt.mb_size)
+
+# Input and interpolation settings (`mi_mode=None` disables interpolation)
+@dataclass(slots=True)
+class InterpOptions:
+    input_fps: float = 15.0
+    fps: int = 60
+    mi_mode: str|None = 'mci'
+    mc_mode: str = 'aobmc'
+    vsbmc: str = '1'
+    me: str = 'epzs'
+    mb_size: int = 16
 
 # Text overlay filter options
 class TextOpt(Enum):
@@ -60,25 +119,163 @@ class TextOpt(Enum):
     shadow_y = 'shadowy'                # offset for text shadow (default 0)
 
 
+_NUM_RE = re.compile(r'(\d+)')
+
+def _natural_key(s: str):
+    # Compare runs of digits by value, so 'frame_2.png' sorts before 'frame_10.png'
+    return [int(t) if t.isdecimal() else t for t in _NUM_RE.split(s)]
+
+
 def get_files(input_dir, input_pattern):
     prefix = '*' if input_pattern != "" else ''
-    ext = '*.png' if ".png" not in input_pattern else '*'
+    has_ext = any(e in input_pattern for e in ('.png', *VIDEO_EXTS))
+    ext = '*.png' if not has_ext else '*'
+    name_ext = '.png' if not has_ext else ''
     
     input_path_root = path.abspath(input_dir)
     input_path_glob = path.join(input_path_root, f'{prefix}{input_pattern}{ext}').replace("\\", "/")
-    input_fullpaths = glob(input_path_glob)
+
+    # Match files in a single directory scan (names containing `input_pattern`, ending in '.png' unless an extension was given).
+    # Names are compared with `normcase`, so matching is case-insensitive on Windows, like `glob`.
+    name_ext, name_pattern = path.normcase(name_ext), path.normcase(input_pattern)
+    try:
+        with scandir(input_path_root) as entries:
+            input_fullpaths = [e.path for e in entries
+                               if (name := path.normcase(e.name)).endswith(name_ext) and name_pattern in name
+                               and not e.name.startswith('.') and e.is_file()]
+    except OSError:
+        input_fullpaths = []
+    input_fullpaths.sort(key=_natural_key)
     
     return (input_path_glob, input_fullpaths)
 
 
+def _write_concat_slice(paths: Iterable[str], out_prefix: str, frame_duration: float, final_frame_dur: int = 1, first_frame: int = 1, debug: bool = False) -> str:
+    paths = list(paths)
+
+    # Name the manifest after its contents, so re-rendering the same frames with other options reuses it
+    key = hashlib.blake2b(f'{_MANIFEST_FORMAT}|{frame_duration}|{final_frame_dur}|{first_frame}|{debug}'.encode(), digest_size=16)
+    for fullpath in paths:
+        key.update(f"{fullpath}\n".encode())
+    out_txt = f"{out_prefix}_{key.hexdigest()}.txt"
+    if path.exists(out_txt):
+        return out_txt
+
+    # Build the frame entries in memory and write them in one call
+    duration_line = f"duration {frame_duration}\n"                         # same duration for every frame
+    lines = []
+    for i, fullpath in enumerate(paths):
+        fullpath = fullpath.translate(_CONCAT_ESCAPE)                       # escape any single-quotes for ffmpeg
+        if debug:
+            lines.append(f"# Frame {first_frame+i}\n")                     # add a comment to mark the frame number
+        lines.append(f"file '{fullpath}'\n" + duration_line)                # add the file path and duration for this frame
+
+    # Append extra references to the final frame, if enabled
+    if final_frame_dur > 1:
+        repeat_block = f"file '{paths[-1].translate(_CONCAT_ESCAPE)}'\n" + duration_line
+        if debug:
+            for j in range(int(final_frame_dur)-1):
+                lines.append(f"# Frame {first_frame+len(paths)+j} - Repeated Final Frame ({j+2}/{int(final_frame_dur)} total)\n"
+                             + repeat_block)
+        else:
+            lines.append(repeat_block * (int(final_frame_dur)-1))
+
+    # Write to a partial file first, so an interrupted write is never mistaken for a finished manifest
+    with open(f"{out_txt}.part", "wb", buffering=MANIFEST_BUFFER_SIZE) as tmp_concat_file:
+        tmp_concat_file.write(f"## Input file for ffmpeg 'concat' format. Total frames: {len(paths)}. Total duration: {len(paths)*frame_duration} s.\n\n".encode())
+        tmp_concat_file.write(''.join(lines).encode())
+    replace(f"{out_txt}.part", out_txt)
+
+    return out_txt
+
+
+def _run_ffmpeg(stream, debug: bool = False, label: str = "") -> bool:
+    import ffmpeg
+
+    # Stream ffmpeg's log as it runs, keeping only the last lines for error reports instead of buffering all of it.
+    # stdout is only piped back in debug mode (the video itself is written straight to the output file).
+    # `-nostdin` keeps (possibly several, concurrent) ffmpeg processes from reading keypresses from, and changing the
+    #   settings of, the CLI's terminal.
+    proc = ffmpeg.run_async(stream.global_args('-nostdin', '-nostats'), pipe_stdout=debug, pipe_stderr=True, overwrite_output=True)
+    tail = deque(maxlen=STDERR_TAIL_LINES)
+    for line in proc.stderr:
+        tail.append(line)
+    out, _ = proc.communicate()
+    err = b''.join(tail)
+
+    if proc.returncode != 0:
+        print(f"-------- Error thrown by ffmpeg{label} --------")
+        print(f"\n[stderr]\n{err}")
+        return False
+
+    if debug:
+        print(f"\n[Output]\n{out}")
+        print(f"\n[Error]\n{err}")
+
+    return True
+
+
+def _concat_copy(paths: List[str], out_txt: str, output_filepath: str, debug: bool = False) -> bool:
+    import ffmpeg
+
+    # Join already-encoded videos with the concat demuxer, copying the streams without re-encoding
+    with open(out_txt, "wb", buffering=MANIFEST_BUFFER_SIZE) as tmp_concat_file:
+        lines = []
+        for fullpath in paths:
+            fullpath = fullpath.translate(_CONCAT_ESCAPE)                   # escape any single-quotes for ffmpeg
+            lines.append(f"file '{fullpath}'\n")
+        tmp_concat_file.write(''.join(lines).encode())
+
+    stream = ffmpeg.input(out_txt, format='concat', safe=0)
+    stream = ffmpeg.output(stream, output_filepath, format='mp4', c='copy', movflags='+faststart')
+
+    return _run_ffmpeg(stream, debug)
+
+
+def _apply_filters(stream, options: InterpOptions, overlay_text: Dict[str, str], engine: Literal['cpu','nvofa'] = 'cpu'):
+    import ffmpeg
+
+    #>> Apply interpolation filter
+    if options.mi_mode == 'blend':
+        stream = ffmpeg.filter(stream, 'minterpolate', **{k.value: getattr(options, k.value) for k in _BLEND_KEYS})
+        
+    elif options.mi_mode == 'mci' and engine == 'nvofa':
+        # Motion estimation on the GPU's Optical Flow Accelerator, which works on frames in CUDA memory
+        stream = ffmpeg.filter(stream, 'format', 'yuv420p')
+        stream = ffmpeg.filter(stream, 'hwupload_cuda')
+        stream = ffmpeg.filter(stream, 'nvinterpolate', fps=options.fps)
+        stream = ffmpeg.filter(stream, 'hwdownload')
+        stream = ffmpeg.filter(stream, 'format', 'yuv420p')
+
+    elif options.mi_mode == 'mci':
+        stream = ffmpeg.filter(stream, 'minterpolate', **{k.value: getattr(options, k.value) for k in _MCI_KEYS})
+
+    #>> Apply text overlay filter
+    if overlay_text.get(TextOpt.text) is not None:
+        overlay_text_kwargs = {}
+        # Prepare keyword args for text overlay
+        for param in overlay_text.keys():
+            overlay_text_kwargs[param.value] = overlay_text[param]
+        
+        stream = ffmpeg.drawtext(stream, escape_text=False, **overlay_text_kwargs)
+
+    return stream
+
+
 def make_video(input_dir: str,
                input_pattern: str,
                output_filename: str,
-               options: Dict[str, str|int|float],
+               options: InterpOptions,
                overlay_text: Dict[str, str] = {},
                final_frame_dur: int = 1,
+               workers: int|None = None,
+               hw_encoder: str|None = None,
+               engine: Literal['cpu','nvofa'] = 'cpu',
                debug: bool = False
                ):
+    import ffmpeg
+    from concurrent.futures import ThreadPoolExecutor
+
     # Other options:
     #  - loop=1 : "loop over input" [.input()]
     #  - search_param=32 : "motion est. search parameter, default=32" [.filter()]
@@ -87,13 +284,12 @@ def make_video(input_dir: str,
     # TODO: Allow for providing a sequence of numbers to specify the duration of each frame (or other properties)?
     # TODO: Allow for non-interactive command-line arg entry.
     # TODO: Add a keybind to skip all remaining prompts and use defaults.
-    # TODO: Delete text file after generation (optionally?).
     # TODO: Fix path for video destination (and other paths?) to work relative to the input folder, and make sure all folders are
     #         correctly read as relative to the terminal directory.
 
-    tmp_concat_file_name = "~ffmpeg_inputs.txt"
+    tmp_concat_file_prefix = "~ffmpeg_inputs"
 
-    frame_duration = round(1/options[GeneralOpt.input_fps], 8)  # frame_duration = "seconds per frame"
+    frame_duration = round(1/options.input_fps, 8)  # frame_duration = "seconds per frame"
     
     input_path_glob, input_fullpaths = get_files(input_dir, input_pattern)
     
@@ -104,36 +300,24 @@ def make_video(input_dir: str,
         print(f"[Error] Found no files matching '{input_path_glob}'")
         return  # TODO: Return error
 
-    with open(tmp_concat_file_name, "wb") as tmp_concat_file:
-        tmp_concat_file.write(f"## Input file for ffmpeg 'concat' format. Total frames: {len(input_fullpaths)}. Total duration: {len(input_fullpaths)*frame_duration} s.\n\n".encode())
-
-        for i, fullpath in enumerate(input_fullpaths):
-            fullpath = fullpath.replace("'", "\\'")                         # escape any single-quotes for ffmpeg
-            tmp_concat_file.write(f"# Frame {i+1}\n".encode())              # add a comment to mark the frame number
-            tmp_concat_file.write(f"file '{fullpath}'\n".encode())          # add the file path for this frame
-            tmp_concat_file.write(f"duration {frame_duration}\n".encode())  # add the duration for this frame
-            
-        # Append extra references to the final frame, if enabled
-        if final_frame_dur > 1:
-            for j in range(int(final_frame_dur)-1):
-                tmp_concat_file.write(f"# Frame {len(input_fullpaths)+j+1} - Repeated Final Frame ({j+2}/{int(final_frame_dur)} total)\n".encode())
-                tmp_concat_file.write(f"file '{input_fullpaths[-1]}'\n".encode())
-                tmp_concat_file.write(f"duration {frame_duration}\n".encode())
+    input_ext = path.splitext(input_fullpaths[0])[1]
+    is_video_input = input_ext.lower() in VIDEO_EXTS
+    output_ext = '_concat.mp4' if is_video_input else '.mp4'  # avoid overwriting the first input video
 
     # Set default output path (matching first input image filename), and set absolute path for a provided filename (inside input folder)
     if output_filename == "":
-        output_filepath = path.abspath(input_fullpaths[0]).removesuffix('.png') + '.mp4'
+        output_filepath = path.abspath(input_fullpaths[0]).removesuffix(input_ext) + output_ext
         # Catch paths that are too long
         if len(output_filepath) > MAX_PATH:
             path_dir = path.dirname(input_fullpaths[0])
-            used_chars = len(path_dir) + len('//') + len('.mp4')
+            used_chars = len(path_dir) + len('//') + len(output_ext)
             if used_chars >= MAX_PATH:
                 print(f"[Error] Output file destination folder too long.")
                 return  # TODO: Return error
             else:
                 # If enough space is left after the dir, use truncated filename
-                path_base = path.basename(input_fullpaths[0]).removesuffix('.png')
-                output_filepath = path.join(path_dir, path_base[:(MAX_PATH - used_chars)] + '.mp4')
+                path_base = path.basename(input_fullpaths[0]).removesuffix(input_ext)
+                output_filepath = path.join(path_dir, path_base[:(MAX_PATH - used_chars)] + output_ext)
     else:
         output_filepath = path.join(path.dirname(input_fullpaths[0]), output_filename)
         # Catch paths that are too long
@@ -141,100 +325,178 @@ def make_video(input_dir: str,
             print(f"[Error] Output filepath too long.")
             return  # TODO: Return error
 
-    #>> Configure input, initialize `stream`
-    stream = ffmpeg.input(tmp_concat_file_name,
-                          format='concat',
-                          safe=0)
-    
-    #>> Apply interpolation filter
-    options_kwargs = {}
-        
-    if options[IntrpOpt.mi_mode] == 'blend':
-        # Prepare keyword args for filter options
-        for arg in options.keys():
-            if arg.value in IntrpOpt.MODE_OPTS_BLEND.value:
-                options_kwargs[arg.value] = options[arg]
-                
-        stream = ffmpeg.filter(stream, 'minterpolate', **options_kwargs)
-        
-    elif options[IntrpOpt.mi_mode] == 'mci':
-        # Prepare keyword args for filter options
-        for arg in options.keys():
-            if arg.value in IntrpOpt.MODE_OPTS_MCI.value:
-                options_kwargs[arg.value] = options[arg]
-                
-        stream = ffmpeg.filter(stream, 'minterpolate', **options_kwargs)
+    # Never read the output file as an input (e.g. the output of a previous run into the same folder)
+    input_fullpaths = [p for p in input_fullpaths if path.normcase(p) != path.normcase(path.abspath(output_filepath))]
+    if len(input_fullpaths) < 1:
+        print(f"[Error] Found no files matching '{input_path_glob}' other than the output file")
+        return  # TODO: Return error
 
-    #>> Apply text overlay filter
-    if overlay_text.get(TextOpt.text) is not None:
-        overlay_text_kwargs = {}
-        # Prepare keyword args for text overlay
-        for param in overlay_text.keys():
-            overlay_text_kwargs[param.value] = overlay_text[param]
-        
-        stream = ffmpeg.drawtext(stream, escape_text=False, **overlay_text_kwargs)
+    # Join pre-rendered videos by copying their streams (filters can only be applied to image sequences)
+    if is_video_input:
+        if options.mi_mode is not None or overlay_text.get(TextOpt.text) is not None:
+            print(f"[Error] Video inputs can only be joined without filters (mi_mode 'none' and no text overlay).")
+            return  # TODO: Return error
+        if final_frame_dur > 1:
+            print(f"[Warning] `final_frame_dur` only applies to image inputs. Ignoring it for video inputs.")
+
+        if not _concat_copy(input_fullpaths, f"{tmp_concat_file_prefix}.txt", output_filepath, debug):
+            return  # TODO: Return error
+        return
+
+    # Fall back to software encoding if the requested hardware encoder is unknown or isn't available
+    if hw_encoder not in ENCODERS:
+        print(f"[Warning] Unrecognized encoder '{hw_encoder}' (must be one of: {', '.join(e for e in ENCODERS if e)}). Using libx264.")
+        hw_encoder = None
+    elif hw_encoder is not None and not _ffmpeg_has('encoders', ENCODERS[hw_encoder]['vcodec']):
+        print(f"[Warning] Encoder '{hw_encoder}' is not available in this ffmpeg build. Using libx264.")
+        hw_encoder = None
+    encoder_kwargs = ENCODERS[hw_encoder]
+
+    # Output frames per input frame
+    frames_ratio = Fraction(options.fps) / Fraction(options.input_fps).limit_denominator(1000)
+
+    # Fall back to `minterpolate` if the NVOFA interpolation filter can't be used
+    if engine == 'nvofa':
+        if not _ffmpeg_has('filters', 'nvinterpolate'):
+            print(f"[Warning] Filter 'nvinterpolate' is not available in this ffmpeg build. Using minterpolate.")
+            engine = 'cpu'
+        elif frames_ratio.denominator != 1:
+            print(f"[Warning] 'nvinterpolate' requires the interpolation FPS to be a multiple of the input FPS. Using minterpolate.")
+            engine = 'cpu'
+
+    # Split the frames across one ffmpeg process per worker, since `minterpolate` is single-threaded.
+    # Text overlays are rendered in a single pass, since drawtext expressions (e.g. `%{pts}`) would restart in each segment.
+    # Without interpolation there's nothing to parallelize (and nothing fixes the output frame rate that segments are
+    #   trimmed by), so that's a single pass too.
+    # Segments can only be joined seamlessly if each one lasts a whole number of output frames, so they are cut on
+    #   multiples of `block_frames` input frames (falling back to a single pass if there are too few blocks).
+    block_frames = frames_ratio.denominator
+    workers = max(min(workers or cpu_count() or 1, len(input_fullpaths) // block_frames), 1)
+    if overlay_text.get(TextOpt.text) is not None or options.mi_mode is None:
+        workers = 1
+    # Consumer GPUs limit the number of concurrent NVENC sessions
+    if hw_encoder is not None:
+        workers = min(workers, NVENC_MAX_SESSIONS)
+
+    #>> Single pass
+    if workers == 1:
+        tmp_concat_file_name = _write_concat_slice(input_fullpaths, tmp_concat_file_prefix, frame_duration, final_frame_dur, debug=debug)
+
+        #>> Configure input, initialize `stream`
+        stream = ffmpeg.input(tmp_concat_file_name,
+                              format='concat',
+                              safe=0)
+
+        stream = _apply_filters(stream, options, overlay_text, engine)
+
+        #>> Configure output
+        stream = ffmpeg.output(stream, output_filepath, format='mp4', **encoder_kwargs)
+
+        #>> Run ffmpeg
+        if not _run_ffmpeg(stream, debug):
+            return  # TODO: Return error
+
+        # Keep the manifest only for debugging, or for retrying a failed run
+        if not debug:
+            remove(tmp_concat_file_name)
 
-    #>> Configure output
-    stream = ffmpeg.output(stream, output_filepath, format='mp4', vcodec='libx264', crf=15)
+    #>> Chunked passes
+    else:
+        segment_fullpaths = []
+        segment_concat_file_names = ["~ffmpeg_segments.txt"]
+        blocks = len(input_fullpaths) // block_frames
+        bounds = [round(k * blocks / workers) * block_frames for k in range(workers)] + [len(input_fullpaths)]
+
+        try:
+            #>> Run one ffmpeg process per segment, each starting as soon as its manifest is written
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = []
+                for k in range(workers):
+                    seg_start, seg_end = bounds[k], bounds[k+1]
+                    seg_fullpath = path.abspath(f"~ffmpeg_segment_{k}.mp4")
+                    segment_fullpaths.append(seg_fullpath)
+
+                    if k < workers-1:
+                        # Include the first frame of the next segment, so frames near the seam are interpolated towards it,
+                        #   then trim the segment back to the output frames covering its own frames.
+                        seg_concat_file_name = _write_concat_slice(islice(input_fullpaths, seg_start, seg_end+1), tmp_concat_file_prefix, frame_duration, first_frame=seg_start+1, debug=debug)
+                        seg_output_kwargs = {'frames:v': int((seg_end - seg_start) * frames_ratio)}
+                    else:
+                        seg_concat_file_name = _write_concat_slice(islice(input_fullpaths, seg_start, None), tmp_concat_file_prefix, frame_duration, final_frame_dur, first_frame=seg_start+1, debug=debug)
+                        seg_output_kwargs = {}
+                    segment_concat_file_names.append(seg_concat_file_name)
+
+                    stream = ffmpeg.input(seg_concat_file_name, format='concat', safe=0)
+                    stream = _apply_filters(stream, options, overlay_text, engine)
+                    stream = ffmpeg.output(stream, seg_fullpath, format='mp4', **encoder_kwargs, **seg_output_kwargs)
+                    results.append(pool.submit(_run_ffmpeg, stream, debug, f" (segment {k+1}/{workers})"))
+
+            if not all(r.result() for r in results):
+                return  # TODO: Return error
+
+            #>> Join the segments without re-encoding
+            if not _concat_copy(segment_fullpaths, segment_concat_file_names[0], output_filepath, debug):
+                return  # TODO: Return error
 
-    #>> Run ffmpeg
+        finally:
+            # Segment manifests depend on the worker count, so they're unlikely to be reused (kept in debug mode for inspection)
+            for tmp_file in segment_fullpaths + ([] if debug else segment_concat_file_names):
+                if path.exists(tmp_file):
+                    remove(tmp_file)
+
+
+def _parse_int_range(choice: str, options: Tuple[int,int], default: int):
     try:
-        out, err = ffmpeg.run(stream, overwrite_output=True, capture_stdout=True, capture_stderr=True)
-    except Error as e:
-        print("-------- Error thrown by `ffmpeg._run` --------")
-        print(f"\n[stdout]\n{e.stdout}")
-        print(f"\n[stderr]\n{e.stderr}")
-    
-    if debug:
-        print(f"\n[Output]\n{out}")
-        print(f"\n[Error]\n{err}")
+        choice = int(choice)
+    except:
+        print(f'Cannot parse "{choice}" as an integer. Using default value: {default}.')
+        return default
 
+    if not options[0] <= choice <= options[1]:
+        print(f'Invalid value: {choice} (must be within {options[0]}-{options[1]}). Using default value: {default}.')
+        return default
 
-def parse_choice(choice: str, options: List[str]|Tuple[int,int]|Tuple[float,float], default: str):
-    # Default on empty choice
-    if choice == "" or choice == None: return default
+    return choice
 
-    # Parse Tuple[int,int] (numerical range) options
-    if isinstance(options, tuple) and isinstance(options[0], int):
-        try:
-            choice = int(choice)
-        except:
-            print(f'Cannot parse "{choice}" as an integer. Using default value: {default}.')
-            return default
 
-        if not options[0] <= choice <= options[1]:
-            print(f'Invalid value: {choice} (must be within {options[0]}-{options[1]}). Using default value: {default}.')
-            return default
+def _parse_float_range(choice: str, options: Tuple[float,float], default: float):
+    try:
+        choice = float(choice)
+    except:
+        print(f'Cannot parse "{choice}" as a float. Using default value: {default}.')
+        return default
+
+    if not options[0] <= choice <= options[1]:
+        print(f'Invalid value: {choice} (must be within {options[0]}-{options[1]}). Using default value: {default}.')
+        return default
 
-        return choice
+    return choice
 
-    # Parse Tuple[float,float] (numerical range) options
-    elif isinstance(options, tuple) and isinstance(options[0], float):
-        try:
-            choice = float(choice)
-        except:
-            print(f'Cannot parse "{choice}" as a float. Using default value: {default}.')
-            return default
-
-        if not options[0] <= choice <= options[1]:
-            print(f'Invalid value: {choice} (must be within {options[0]}-{options[1]}). Using default value: {default}.')
-            return default
-
-        return choice
-
-    # Parse List[str] options
-    elif isinstance(options, list):
-        for opt in options:
-            if choice.strip().lower() == opt:
-                return opt
-        else:
-            print(f'Unrecognized value "{choice}". Using default value: {default}.')
-            return default
 
-    else:
+def _parse_list(choice: str, options: FrozenSet[str]|List[str], default: str):
+    key = choice.strip().lower()
+    if key in options:
+        return key
+
+    print(f'Unrecognized value "{choice}". Using default value: {default}.')
+    return default
+
+
+# Parser for each kind of `options`: Tuple[int,int] and Tuple[float,float] (numerical ranges), or FrozenSet[str]/List[str]
+_PARSERS = {int: _parse_int_range, float: _parse_float_range, frozenset: _parse_list, list: _parse_list}
+
+def parse_choice(choice: str, options: FrozenSet[str]|List[str]|Tuple[int,int]|Tuple[float,float], default: str):
+    # Default on empty choice
+    if choice == "" or choice == None: return default
+
+    kind = type(options[0]) if isinstance(options, tuple) else type(options)
+    parser = _PARSERS.get(kind)
+    if parser is None:
         print(f'Something went wrong... Using default value: {default}.')
         return default
 
+    return parser(choice, options, default)
+
 
 if __name__ == '__main__':
     filter_options = {
@@ -243,6 +505,9 @@ if __name__ == '__main__':
         IntrpOpt.me: ['ds', 'epzs', 'esa', 'fss', 'hexbs', 'ntss', 'tdls', 'tss', 'umh'],
         IntrpOpt.mb_size: (1,512),
     }
+    # Sets of the allowed values for each list option, built once for parsing choices (the lists keep the prompt order)
+    filter_option_sets = {option: frozenset(values) for option, values in filter_options.items() if isinstance(values, list)}
+    mi_modes = frozenset(['blend', 'mci', 'none'])
     filter_defaults = {
         IntrpOpt.mc_mode: 'aobmc',
         IntrpOpt.vsbmc: '1',
@@ -261,12 +526,12 @@ if __name__ == '__main__':
     #### CLI ####
     retry_loop = True
     while retry_loop:
-        choices = {}
+        choices = InterpOptions()
         retry_loop = False
 
         # Collect general options
         c_in = input('Path to folder containing image files (can be relative) [^"."]: ')
-        c_in = c_in.strip().replace('\\', '/')  # BUG: Handle '[', ']', and other chars in filepath. glob fails if these are included.
+        c_in = c_in.strip().replace('\\', '/')
         input_dir = c_in if (c_in != "") else "."
 
         c_in = input('Pattern to match files in folder [^""]: ')
@@ -278,16 +543,18 @@ if __name__ == '__main__':
             output_filename += ".mp4"
 
         c_in = input('Input FPS [^15]: ')
-        choices[GeneralOpt.input_fps] = parse_choice(c_in, (0.1, 144.0), 15.0)
+        choices.input_fps = parse_choice(c_in, (0.1, 144.0), 15.0)
 
         c_in = input('Interpolation FPS [^60]: ')
-        choices[IntrpOpt.fps] = parse_choice(c_in, (1, 144), 60)
+        choices.fps = parse_choice(c_in, (1, 144), 60)
 
-        c_in = input(f'{IntrpOpt.mi_mode.value} [^mci/blend]: ')
-        choices[IntrpOpt.mi_mode] = parse_choice(c_in, ['blend', 'mci'], 'mci')
+        c_in = input(f'{IntrpOpt.mi_mode.value} [^mci/blend/none]: ')
+        choices.mi_mode = parse_choice(c_in, mi_modes, 'mci')
+        if choices.mi_mode == 'none':
+            choices.mi_mode = None  # no interpolation (required for joining video files)
 
         # Continue collecting 'mci' filter options, if selected
-        if choices[IntrpOpt.mi_mode] == 'mci':
+        if choices.mi_mode == 'mci':
             for option in filter_options.keys():
                 # Make prompt string
                 pmt_start = f'{option.value} ['
@@ -299,7 +566,7 @@ if __name__ == '__main__':
 
                 # Read choice
                 c_in = input(pmt)
-                choices[option] = parse_choice(c_in, filter_options[option], filter_defaults[option])
+                setattr(choices, option.value, parse_choice(c_in, filter_option_sets.get(option, filter_options[option]), filter_defaults[option]))
 
         result = make_video(input_dir, input_pattern, output_filename, choices)
 